@@ -0,0 +1,239 @@
+"""Persistent cache of the imports parsed from Python modules."""
+
+import atexit
+import hashlib
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional, Set, Tuple, Union
+
+if TYPE_CHECKING:
+    from allowed_import_aliases.parse import AsName
+
+_SCHEMA_VERSION = 3
+"""Incremented whenever the pickled representation of cached imports changes."""
+
+_BATCH_SIZE = 256
+"""Pending writes are committed in one transaction once this many have accumulated."""
+
+_MAX_ROWS = 100_000
+"""Once the cache holds more rows than this, the oldest are pruned."""
+
+_STALE_SECONDS = 30 * 24 * 60 * 60
+"""Cache databases of other versions which are unused for this long are deleted."""
+
+_local = threading.local()
+"""Per-thread SQLite connections; connections cannot be shared across threads."""
+
+_pending: Dict[str, Tuple[bytes, Dict[str, Set["AsName"]]]] = {}
+"""Writes not yet committed, keyed by absolute path; shared by every thread."""
+
+_pending_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _parser_digest() -> str:
+    """
+    Returns:
+        A digest of the module which extracts imports, so that a cache is never read
+        by a version of the package which would have extracted different imports.
+    """
+    try:
+        source = Path(__file__).with_name("parse.py").read_bytes()
+    except OSError:
+        return "unknown"
+    return hashlib.sha256(source).hexdigest()[:16]
+
+
+def get_cache_path() -> Path:
+    """
+    Returns:
+        The filepath of the SQLite database. The directory may be set using the
+        ``AIA_CACHE_DIR`` environment variable and otherwise defaults to
+        ``$XDG_CACHE_HOME/allowed-import-aliases`` or ``~/.cache/allowed-import-aliases``.
+        The filename is specific to the Python version and the import extraction logic.
+    """
+    directory = os.environ.get("AIA_CACHE_DIR")
+    if directory is None:
+        directory = os.path.join(
+            os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+            "allowed-import-aliases",
+        )
+    major, minor = sys.version_info[:2]
+    return Path(
+        directory,
+        f"imports-v{_SCHEMA_VERSION}-py{major}.{minor}-{_parser_digest()}.sqlite",
+    )
+
+
+def _remove_stale_databases(path: Path) -> None:
+    """
+    Delete the databases of other schema, Python, or package versions which have not
+    been used for ``_STALE_SECONDS``.
+
+    Args:
+        path (Path):
+            The filepath of the current SQLite database, which is kept.
+    """
+    cutoff = time.time() - _STALE_SECONDS
+    for sibling in path.parent.glob("imports-*.sqlite*"):
+        if sibling.name.startswith(path.name):
+            continue
+        try:
+            if sibling.stat().st_mtime < cutoff:
+                sibling.unlink()
+        except OSError:
+            pass
+
+
+def _connect() -> Optional[sqlite3.Connection]:
+    """
+    Returns:
+        A SQLite connection for the current thread and process,
+        or ``None`` if the cache is disabled or cannot be opened.
+    """
+    if os.environ.get("AIA_NO_CACHE") == "1":
+        return None
+    key: Tuple[int, Path] = (os.getpid(), get_cache_path())
+    connections: Dict[Tuple[int, Path], Optional[sqlite3.Connection]] = getattr(
+        _local, "connections", {}
+    )
+    _local.connections = connections
+    if key not in connections:
+        try:
+            key[1].parent.mkdir(parents=True, exist_ok=True)
+            if not key[1].exists():
+                _remove_stale_databases(key[1])
+            connection = sqlite3.connect(key[1], timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache"
+                " (path TEXT, sha256 BLOB, imports BLOB, PRIMARY KEY(path))"
+            )
+        except (OSError, sqlite3.Error):
+            connections[key] = None
+        else:
+            connections[key] = connection
+    return connections[key]
+
+
+def get(
+    path: Union[str, os.PathLike], sha256: bytes
+) -> Optional[Dict[str, Set["AsName"]]]:
+    """
+    Args:
+        path (Union[str, os.PathLike]):
+            The filepath to a Python module.
+
+        sha256 (bytes):
+            The SHA-256 digest of the Python module's contents.
+
+    Returns:
+        The cached imports of the Python module, or ``None`` on a cache miss.
+    """
+    connection = _connect()
+    if connection is None:
+        return None
+    abspath = os.path.abspath(path)
+    with _pending_lock:
+        pending = _pending.get(abspath)
+    if pending is not None:
+        return pending[1] if pending[0] == sha256 else None
+    try:
+        row = connection.execute(
+            "SELECT imports FROM cache WHERE path=? AND sha256=?",
+            (abspath, sha256),
+        ).fetchone()
+    except sqlite3.Error:
+        return None
+    return None if row is None else pickle.loads(row[0])
+
+
+def put(
+    path: Union[str, os.PathLike], sha256: bytes, imports: Dict[str, Set["AsName"]]
+) -> None:
+    """
+    Queue the imports of a Python module to be written by the next ``flush``,
+    which happens automatically every ``_BATCH_SIZE`` writes and at exit.
+
+    Args:
+        path (Union[str, os.PathLike]):
+            The filepath to a Python module.
+
+        sha256 (bytes):
+            The SHA-256 digest of the Python module's contents.
+
+        imports (Dict[str, Set[AsName]]):
+            The imports parsed from the Python module.
+    """
+    if os.environ.get("AIA_NO_CACHE") == "1":
+        return
+    with _pending_lock:
+        _pending[os.path.abspath(path)] = (sha256, dict(imports))
+        full = len(_pending) >= _BATCH_SIZE
+    if full:
+        flush()
+
+
+def flush() -> None:
+    """
+    Commit the queued writes in a single transaction, then prune the cache
+    if it holds more than ``_MAX_ROWS`` rows.
+    """
+    global _pending
+    with _pending_lock:
+        pending, _pending = _pending, {}
+    if not pending:
+        return
+    connection = _connect()
+    if connection is None:
+        return
+    try:
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO cache (path, sha256, imports) VALUES (?, ?, ?)",
+                (
+                    (path, sha256, pickle.dumps(imports))
+                    for path, (sha256, imports) in pending.items()
+                ),
+            )
+        _prune(connection)
+    except sqlite3.Error:
+        pass
+
+
+def _prune(connection: sqlite3.Connection) -> None:
+    """
+    Bring the cache back under three quarters of ``_MAX_ROWS`` rows, first by deleting
+    the rows of files which no longer exist and then, if need be, the oldest rows.
+
+    Args:
+        connection (sqlite3.Connection):
+            A connection to the cache.
+    """
+    (count,) = connection.execute("SELECT COUNT(*) FROM cache").fetchone()
+    if count <= _MAX_ROWS:
+        return
+    missing = [
+        (path,)
+        for (path,) in connection.execute("SELECT path FROM cache")
+        if not os.path.exists(path)
+    ]
+    with connection:
+        connection.executemany("DELETE FROM cache WHERE path=?", missing)
+        excess = count - len(missing) - _MAX_ROWS * 3 // 4
+        if excess > 0:
+            # Rows are replaced on every write, so the lowest rowids are the oldest.
+            connection.execute(
+                "DELETE FROM cache WHERE rowid IN"
+                " (SELECT rowid FROM cache ORDER BY rowid LIMIT ?)",
+                (excess,),
+            )
+
+
+atexit.register(flush)
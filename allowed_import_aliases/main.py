@@ -1,31 +1,137 @@
 """Main entrypoint."""
 
 import argparse
-import datetime
+import atexit
+import concurrent.futures
+import itertools
+import logging
+import operator
 import os
 import pathlib
+import queue
+import stat
+import sys
+import threading
 from collections import defaultdict
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
-from functools import partial
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from functools import lru_cache
 from typing import (
+    AbstractSet,
+    Callable,
     DefaultDict,
+    Dict,
+    FrozenSet,
     Generator,
     Iterable,
     Iterator,
     List,
+    Literal,
     Mapping,
     Optional,
     Sequence,
     Set,
     Tuple,
+    Type,
+    TypeVar,
     Union,
 )
 
-from allowed_import_aliases.parse import DisallowedImportAlias, evaluate_file
+from allowed_import_aliases import _import_cache
+from allowed_import_aliases.parse import (
+    DisallowedImportAlias,
+    evaluate_file,
+    evaluate_imports,
+    get_imports_from_buffer,
+    may_contain_aliased_import,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def _scan(
+    directory: Union[pathlib.Path, str],
+    sizes: bool = False,
+) -> Iterator[Tuple[str, int]]:
+    """
+    Recursively find the Python files in a directory.
+
+    Args:
+        directory:
+            The directory to scan.
+        sizes:
+            Whether to stat each file for its size.
+
+    Returns:
+        An Iterator of each Python file's path and size in bytes, or 0 unless ``sizes``.
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scan(entry.path, sizes)
+            elif entry.name.endswith(".py") and entry.is_file():
+                yield entry.path, entry.stat().st_size if sizes else 0
+
+
+def _expand(
+    filenames: Iterable[Union[pathlib.Path, str]],
+    sizes: bool = False,
+) -> Iterator[Tuple[str, int]]:
+    """
+    Expand directories into the Python files they contain, pairing each file with its
+    size, when known, so that it is never stat'ed again.
+
+    Args:
+        filenames:
+            Python files and directories.
+        sizes:
+            Whether to stat the files found in directories for their sizes; only
+            ``_longest_first`` needs them.
+
+    Returns:
+        An Iterator of each Python file's path and size in bytes. Files found in
+        directories have a size of 0 unless ``sizes``.
+    """
+    for filename in filenames:
+        st = os.stat(filename)
+        if stat.S_ISDIR(st.st_mode):
+            yield from _scan(filename, sizes)
+        else:
+            yield str(filename), st.st_size
+
+
+def _longest_first(
+    files: Sequence[Tuple[str, int]],
+    max_workers: int,
+) -> List[Tuple[str, int]]:
+    """
+    Order files largest first, so that no worker is left parsing a large file
+    while the others sit idle (longest-processing-time-first scheduling).
+
+    Args:
+        files:
+            Python files to evaluate and their sizes in bytes, as returned by ``_expand``.
+        max_workers:
+            The number of workers to which the files will be dispatched.
+
+    Returns:
+        The files sorted by size, descending, if there are more than twice as many
+        files as workers; otherwise, the files in their original order.
+    """
+    if len(files) <= 2 * max_workers:
+        return list(files)
+    return sorted(files, key=operator.itemgetter(1), reverse=True)
 
 
 def _serial(
-    allowed_aliases: Mapping[str, Set[str]],
+    allowed_aliases: Mapping[str, AbstractSet[str]],
     filenames: Iterable[Union[pathlib.Path, str]],
 ) -> Iterator[Generator[DisallowedImportAlias, None, None]]:
     """
@@ -38,7 +144,7 @@ def _serial(
             Python files to evaluate.
 
     Returns:
-        An Iterator of Generators, each producing a ``DisallowedImportAlias`` exception.
+        An Iterator of Generators, each producing ``DisallowedImportAlias`` instances.
     """
     return (
         evaluate_file(allowed_aliases=allowed_aliases, filepath=filename)
@@ -46,11 +152,344 @@ def _serial(
     )
 
 
+_allowed_aliases: Mapping[str, AbstractSet[str]] = {}
+"""The allowed aliases of a worker process, set once by ``_initialize_worker``."""
+
+
+def _initialize_worker(allowed_aliases: Mapping[str, AbstractSet[str]]) -> None:
+    """
+    Store the allowed aliases in a worker process so they are pickled once per worker.
+
+    Args:
+        allowed_aliases:
+            Key-value pair of fully-qualified name and one or more acceptable aliases.
+    """
+    global _allowed_aliases
+    _allowed_aliases = allowed_aliases
+
+
+def _evaluate_bytes(
+    allowed_aliases: Mapping[str, AbstractSet[str]],
+    filepath: str,
+    source: bytes,
+) -> List[DisallowedImportAlias]:
+    """
+    Evaluate the contents of a Python file.
+
+    Args:
+        allowed_aliases:
+            Key-value pair of fully-qualified name and one or more acceptable aliases.
+        filepath:
+            The Python file from which ``source`` was read.
+        source:
+            Bytes of Python code.
+
+    Returns:
+        A list of ``DisallowedImportAlias`` instances; generators cannot be pickled.
+    """
+    imports = get_imports_from_buffer(source, filepath=filepath)
+    return list(evaluate_imports(allowed_aliases, imports, filename=filepath))
+
+
+def _evaluate_sources_in_worker(
+    items: Sequence[Tuple[str, bytes]],
+) -> List[List[DisallowedImportAlias]]:
+    """
+    Evaluate the contents of Python files using the allowed aliases stored by
+    ``_initialize_worker``.
+
+    Args:
+        items:
+            A chunk of filepaths and the bytes read from them.
+
+    Returns:
+        A list of lists, each containing ``DisallowedImportAlias`` instances.
+    """
+    results = [_evaluate_bytes(_allowed_aliases, *item) for item in items]
+    # Worker processes do not run atexit hooks, so commit the chunk's cache writes now.
+    _import_cache.flush()
+    return results
+
+
+def _evaluate_files_in_interpreter(
+    filenames: Sequence[Union[pathlib.Path, str]],
+) -> List[Tuple[str, ...]]:
+    """
+    Evaluate files using the allowed aliases stored by ``_initialize_worker``.
+
+    Args:
+        filenames:
+            A chunk of Python files to evaluate.
+
+    Returns:
+        A list of tuples of error message strings,
+        which are cheap to share between interpreters.
+    """
+    results = [
+        tuple(
+            str(problem)
+            for problem in evaluate_file(
+                allowed_aliases=_allowed_aliases, filepath=filename
+            )
+        )
+        for filename in filenames
+    ]
+    _import_cache.flush()
+    return results
+
+
+def _evaluate_file_list(
+    allowed_aliases: Mapping[str, AbstractSet[str]],
+    filename: Union[pathlib.Path, str],
+) -> List[DisallowedImportAlias]:
+    """
+    Evaluate a file, materializing its problems inside the worker.
+
+    Args:
+        allowed_aliases:
+            Key-value pair of fully-qualified name and one or more acceptable aliases.
+        filename:
+            A Python file to evaluate.
+
+    Returns:
+        A list of ``DisallowedImportAlias`` instances.
+    """
+    return list(evaluate_file(allowed_aliases=allowed_aliases, filepath=filename))
+
+
+def _chunks(iterable: Iterable[T], chunksize: int) -> Iterator[List[T]]:
+    """
+    Args:
+        iterable:
+            The items to split.
+        chunksize:
+            The maximum number of items per chunk.
+
+    Returns:
+        An Iterator of lists of at most ``chunksize`` items.
+    """
+    iterator = iter(iterable)
+    chunk = list(itertools.islice(iterator, chunksize))
+    while chunk:
+        yield chunk
+        chunk = list(itertools.islice(iterator, chunksize))
+
+
+def _as_completed_chunks(
+    executor: Executor,
+    fn: Callable[[List[T]], List[R]],
+    iterable: Iterable[T],
+    chunksize: int,
+    max_pending: int,
+) -> Iterator[R]:
+    """
+    Submit chunks of items to an executor and yield their results as chunks complete.
+
+    At most ``max_pending`` chunks are in flight; another chunk is taken from
+    ``iterable`` only as one completes, so a lazy ``iterable`` is not drained ahead.
+
+    Args:
+        executor:
+            The executor to which chunks are submitted.
+        fn:
+            A function evaluating a chunk, returning one result per item.
+        iterable:
+            The items to evaluate.
+        chunksize:
+            The maximum number of items per chunk.
+        max_pending:
+            The maximum number of chunks submitted but not yet completed.
+
+    Returns:
+        An Iterator of results, in chunk completion order.
+    """
+    chunks = _chunks(iterable, chunksize)
+    pending = {
+        executor.submit(fn, chunk) for chunk in itertools.islice(chunks, max_pending)
+    }
+    while pending:
+        done, pending = concurrent.futures.wait(
+            pending, return_when=concurrent.futures.FIRST_COMPLETED
+        )
+        for chunk in itertools.islice(chunks, len(done)):
+            pending.add(executor.submit(fn, chunk))
+        for future in done:
+            yield from future.result()
+
+
+def _read_source(filename: Union[pathlib.Path, str]) -> Tuple[str, bytes]:
+    """
+    Args:
+        filename:
+            A Python file to read.
+
+    Returns:
+        The filepath as a string and the bytes read from it.
+    """
+    return str(filename), pathlib.Path(filename).read_bytes()
+
+
+_IndexedSource = Tuple[int, Optional[Tuple[str, bytes]]]
+
+
+def _read_ahead(
+    filenames: Iterable[Union[pathlib.Path, str]],
+    max_workers: int,
+) -> Iterator[Tuple[str, bytes]]:
+    """
+    Read files on a pool of I/O threads, discarding those without aliased imports.
+
+    At most ``2 * max_workers`` files are queued ahead of the consumer. Files are
+    yielded in the order of ``filenames``, so an ordering such as largest-first
+    survives the read-ahead; those read out of order wait in a small reorder buffer.
+
+    Args:
+        filenames:
+            Python files to read.
+        max_workers:
+            The number of workers consuming the files.
+
+    Returns:
+        An Iterator of filepaths and the bytes read from them, in input order.
+    """
+    sources: "queue.Queue[Union[_IndexedSource, BaseException, None]]" = queue.Queue(
+        maxsize=2 * max_workers
+    )
+    cancelled = threading.Event()
+
+    def read(index: int, filename: Union[pathlib.Path, str]) -> None:
+        if cancelled.is_set():
+            return
+        try:
+            filepath, source = _read_source(filename)
+            kept = (filepath, source) if may_contain_aliased_import(source) else None
+            # Discarded files still report their index so later files are not held back.
+            sources.put((index, kept))
+        except BaseException as e:
+            sources.put(e)
+
+    def produce() -> None:
+        with ThreadPoolExecutor(
+            max_workers=min(32, 4 * max_workers),
+            thread_name_prefix="python-import-alias-reader-",
+        ) as reader:
+            for index, filename in enumerate(filenames):
+                reader.submit(read, index, filename)
+        sources.put(None)
+
+    threading.Thread(target=produce, daemon=True).start()
+    done = False
+    buffered: Dict[int, Optional[Tuple[str, bytes]]] = {}
+    next_index = 0
+    try:
+        while True:
+            item = sources.get()
+            if item is None:
+                done = True
+                return
+            if isinstance(item, BaseException):
+                raise item
+            buffered[item[0]] = item[1]
+            while next_index in buffered:
+                source = buffered.pop(next_index)
+                next_index += 1
+                if source is not None:
+                    yield source
+    finally:
+        if not done:
+            # Unblock any readers waiting on the full queue so the producer can finish.
+            cancelled.set()
+            while sources.get() is not None:
+                pass
+
+
+# Added in Python 3.14; each worker is a subinterpreter with its own GIL.
+_InterpreterPoolExecutor: Optional[Type[ThreadPoolExecutor]] = getattr(
+    concurrent.futures, "InterpreterPoolExecutor", None
+)
+
+_PoolKey = Tuple[str, Optional[int], Optional[FrozenSet[Tuple[str, FrozenSet[str]]]]]
+
+_pools: Dict[str, Tuple[_PoolKey, Executor]] = {}
+"""At most one executor per kind, kept alive across ``main()`` invocations."""
+
+
+def _shutdown_pools() -> None:
+    """Shut down every persistent executor."""
+    while _pools:
+        _, (_, pool) = _pools.popitem()
+        pool.shutdown()
+
+
+atexit.register(_shutdown_pools)
+
+
+def _get_pool(
+    kind: Literal["thread", "process", "interpreter"],
+    max_workers: Optional[int],
+    allowed_aliases: Mapping[str, AbstractSet[str]],
+) -> Executor:
+    """
+    Get or lazily create a persistent executor.
+
+    At most one executor of each kind is kept; it is reused while ``max_workers`` and,
+    for process and interpreter pools, which receive ``allowed_aliases`` through
+    ``_initialize_worker``, the allowed aliases stay the same. Otherwise the previous
+    executor of that kind is shut down and replaced. Interpreter pools fall back to
+    process pools before Python 3.14. Every executor is shut down at exit.
+
+    Args:
+        kind:
+            One of ``"thread"``, ``"process"``, or ``"interpreter"``.
+        max_workers:
+            The number of workers to use.
+        allowed_aliases:
+            Key-value pair of fully-qualified name and one or more acceptable aliases.
+
+    Returns:
+        A ``ThreadPoolExecutor``, ``InterpreterPoolExecutor``, or ``ProcessPoolExecutor``.
+    """
+    frozen = (
+        None
+        if kind == "thread"
+        else frozenset((k, frozenset(v)) for k, v in allowed_aliases.items())
+    )
+    key: _PoolKey = (kind, max_workers, frozen)
+    current = _pools.get(kind)
+    if current is not None and current[0] == key:
+        return current[1]
+    if current is not None:
+        current[1].shutdown()
+    pool: Executor
+    if kind == "thread":
+        pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="python-import-alias-",
+            initializer=None,
+        )
+    elif kind == "interpreter" and _InterpreterPoolExecutor is not None:
+        pool = _InterpreterPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="python-import-alias-",
+            initializer=_initialize_worker,
+            initargs=(dict(allowed_aliases),),
+        )
+    else:
+        pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_initialize_worker,
+            initargs=(dict(allowed_aliases),),
+        )
+    _pools[kind] = (key, pool)
+    return pool
+
+
 def _multithread(
-    allowed_aliases: Mapping[str, Set[str]],
+    allowed_aliases: Mapping[str, AbstractSet[str]],
     filenames: Iterable[Union[pathlib.Path, str]],
     max_workers: Optional[int] = None,
-) -> Iterator[Generator[DisallowedImportAlias, None, None]]:
+    executor: Optional[Executor] = None,
+) -> Iterator[List[DisallowedImportAlias]]:
     """
     Evaluate files using one or more threads.
 
@@ -61,28 +500,30 @@ def _multithread(
             Python files to evaluate.
         max_workers:
             The number of workers to use.
+        executor:
+            An existing executor to use. Defaults to a persistent ``ThreadPoolExecutor``.
 
     Returns:
-        An Iterator of Generators, each producing a ``DisallowedImportAlias`` exception.
+        An Iterator of lists, each containing ``DisallowedImportAlias`` instances,
+        in completion order.
     """
-    with ThreadPoolExecutor(
-        max_workers=max_workers,
-        thread_name_prefix="python-import-alias-",
-        initializer=None,
-    ) as thread_pool_executor:
-        return thread_pool_executor.map(
-            partial(evaluate_file, allowed_aliases),
-            filenames,
-        )
+    if executor is None:
+        executor = _get_pool("thread", max_workers, allowed_aliases)
+    futures = [
+        executor.submit(_evaluate_file_list, allowed_aliases, filename)
+        for filename in filenames
+    ]
+    return (future.result() for future in as_completed(futures))
 
 
 def _multiprocess(
-    allowed_aliases: Mapping[str, Set[str]],
+    allowed_aliases: Mapping[str, AbstractSet[str]],
     filenames: Iterable[Union[pathlib.Path, str]],
     max_workers: Optional[int] = None,
-) -> Iterator[Generator[DisallowedImportAlias, None, None]]:
+    executor: Optional[Executor] = None,
+) -> Iterator[List[DisallowedImportAlias]]:
     """
-    Evaluate files using one or more processes.
+    Evaluate files using one or more processes, fed by a pool of I/O threads.
 
     Args:
         allowed_aliases:
@@ -91,34 +532,105 @@ def _multiprocess(
             Python files to evaluate.
         max_workers:
             The number of workers to use.
+        executor:
+            An existing executor whose workers were initialized by ``_initialize_worker``.
+            Defaults to a persistent ``ProcessPoolExecutor``.
 
     Returns:
-        An Iterator of Generators, each producing a ``DisallowedImportAlias`` exception.
+        An Iterator of lists, each containing ``DisallowedImportAlias`` instances.
     """
-    with ProcessPoolExecutor(
-        max_workers=max_workers,
-        initializer=None,
-    ) as process_pool_executor:
-        return process_pool_executor.map(
-            partial(evaluate_file, allowed_aliases),
-            filenames,
-        )
+    if executor is None:
+        executor = _get_pool("process", max_workers, allowed_aliases)
+    return _pipeline(executor, filenames, max_workers)
+
+
+def _pipeline(
+    executor: Executor,
+    filenames: Iterable[Union[pathlib.Path, str]],
+    max_workers: Optional[int] = None,
+) -> Iterator[List[DisallowedImportAlias]]:
+    """
+    Read files on a pool of I/O threads while ``executor`` parses those already read.
+
+    Args:
+        executor:
+            An executor whose workers were initialized by ``_initialize_worker``.
+        filenames:
+            Python files to evaluate.
+        max_workers:
+            The number of workers of ``executor``.
+
+    Returns:
+        An Iterator of lists, each containing ``DisallowedImportAlias`` instances,
+        in completion order.
+    """
+    filenames = list(filenames)
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(filenames) // (workers * 4))
+    return _as_completed_chunks(
+        executor,
+        _evaluate_sources_in_worker,
+        _read_ahead(filenames, workers),
+        chunksize,
+        2 * workers,
+    )
+
+
+def _multi_interpreter(
+    allowed_aliases: Mapping[str, AbstractSet[str]],
+    filenames: Iterable[Union[pathlib.Path, str]],
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> Iterator[Tuple[str, ...]]:
+    """
+    Evaluate files using one or more subinterpreters, each with its own GIL.
+
+    Falls back to processes before Python 3.14.
+
+    Args:
+        allowed_aliases:
+            Key-value pair of fully-qualified name and one or more acceptable aliases.
+        filenames:
+            Python files to evaluate.
+        max_workers:
+            The number of workers to use.
+        executor:
+            An existing executor whose workers were initialized by ``_initialize_worker``.
+            Defaults to a persistent ``InterpreterPoolExecutor``.
+
+    Returns:
+        An Iterator of tuples, each containing error message strings.
+    """
+    if executor is None:
+        executor = _get_pool("interpreter", max_workers, allowed_aliases)
+    filenames = list(filenames)
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(filenames) // (workers * 4))
+    return _as_completed_chunks(
+        executor,
+        _evaluate_files_in_interpreter,
+        filenames,
+        chunksize,
+        2 * workers,
+    )
 
 
 def _validate_args(
     t: Optional[List[int]],
     p: Optional[List[int]],
-) -> Tuple[Optional[int], Optional[int]]:
+    i: Optional[List[int]] = None,
+) -> Tuple[Optional[int], Optional[int], Optional[int]]:
     """
     Args:
         t: The argument passed to ``-t``.
         p: The argument passed to ``-p``.
+        i: The argument passed to ``-i``.
 
     Returns:
-        A tuple of two integers.
+        A tuple of three integers.
     """
-    if t is not None and p is not None:
-        raise ValueError("-t and -p are mutually exclusive.")
+    if sum(arg is not None for arg in (t, p, i)) > 1:
+        raise ValueError("-t, -p, and -i are mutually exclusive.")
 
     if t is None:
         _t = None
@@ -141,10 +653,46 @@ def _validate_args(
             raise ValueError("-p can only accept one integer argument.")
         if _p < 0:
             raise ValueError("-p cannot take a value less than 0.")
-    return _t, _p
 
+    if i is None:
+        _i = None
+    else:
+        if len(i) > 1:
+            raise ValueError("-i can only accept one integer argument.")
+        _i = i[0]
+        if not isinstance(_i, int):
+            raise ValueError("-i can only accept one integer argument.")
+        if _i < 0:
+            raise ValueError("-i cannot take a value less than 0.")
+    return _t, _p, _i
 
-def main(argv: Optional[Sequence[str]] = None) -> int:
+
+def _nonneg_int(value: str) -> int:
+    """
+    Args:
+        value: The argument passed to ``-p`` or ``-i``.
+
+    Returns:
+        The argument as an integer between 0 and the number of processors, inclusive.
+    """
+    try:
+        _value = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{value!r} is not an integer.") from None
+    cpu_count = os.cpu_count() or 0
+    if not 0 <= _value <= cpu_count:
+        raise argparse.ArgumentTypeError(
+            f"{_value} is not between 0 and {cpu_count}, inclusive."
+        )
+    return _value
+
+
+@lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
+    """
+    Returns:
+        The command-line argument parser, built once per process.
+    """
     parser = argparse.ArgumentParser()
     parser.add_argument("filenames", nargs="*")
     parser.add_argument(
@@ -168,9 +716,8 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     )
     parser.add_argument(
         "-p",
-        type=int,
+        type=_nonneg_int,
         action="store",
-        choices=(range(0, (os.cpu_count() or 0) + 1)),
         help="""
             The number of workers to use.
             If equal to 0, it will default to the number of processors on the machine.
@@ -179,48 +726,86 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         nargs=1,
         default=None,
     )
+    parser.add_argument(
+        "-i",
+        type=_nonneg_int,
+        action="store",
+        help="""
+            The number of subinterpreters to use (processes before Python 3.14).
+            If equal to 0, it will default to the number of processors on the machine.
+        """,
+        required=False,
+        nargs=1,
+        default=None,
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Log debugging information to standard error.",
+    )
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = _build_parser()
     args = parser.parse_args(argv)
+    if args.verbose:
+        logging.basicConfig(level=logging.DEBUG)
     if args.a is None:
         return 0
 
     allowed_aliases: DefaultDict[str, Set[str]] = defaultdict(set)
-    t, p = _validate_args(t=args.t, p=args.p)
+    t, p, i = _validate_args(t=args.t, p=args.p, i=args.i)
 
     try:
         for arguments in args.a:
             qualname, *aliases = arguments[0].strip().split(" ")
-            allowed_aliases[qualname].update(aliases)
+            allowed_aliases[sys.intern(qualname)].update(map(sys.intern, aliases))
     except TypeError as e:
         raise Exception(f"{args}") from e
 
-    print(f"{datetime.datetime.now()=}")
-    print(f"{args.filenames=}")
+    # Plain dict of frozensets: cheaper lookups, cached hashes, safely shared read-only.
+    allowed: Dict[str, FrozenSet[str]] = {
+        qualname: frozenset(aliases) for qualname, aliases in allowed_aliases.items()
+    }
+
+    logger.debug("filenames=%r", args.filenames)
+    logger.debug("allowed_aliases=%r", allowed)
 
+    workers = next((w for w in (t, p, i) if w is not None), None)
+    files = list(_expand(args.filenames, sizes=workers is not None))
+    if workers is not None:
+        files = _longest_first(files, max_workers=workers or os.cpu_count() or 1)
+    filenames = [filename for filename, _ in files]
+
+    problems: Iterator[Iterable[Union[DisallowedImportAlias, str]]]
     if t is not None:
         problems = _multithread(
-            allowed_aliases=allowed_aliases,
-            filenames=args.filenames,
+            allowed_aliases=allowed,
+            filenames=filenames,
             max_workers=t or None,
         )
     elif p is not None:
         problems = _multiprocess(
-            allowed_aliases=allowed_aliases,
-            filenames=args.filenames,
+            allowed_aliases=allowed,
+            filenames=filenames,
             max_workers=p or None,
         )
+    elif i is not None:
+        problems = _multi_interpreter(
+            allowed_aliases=allowed,
+            filenames=filenames,
+            max_workers=i or None,
+        )
     else:
-        problems = _serial(allowed_aliases=allowed_aliases, filenames=args.filenames)
+        problems = _serial(allowed_aliases=allowed, filenames=filenames)
 
     exit_code: int = 0
-    for problem in problems:  # type: Generator
-        try:
-            p = next(problem)
-            print(p)
+    for file_problems in problems:
+        for problem in file_problems:
+            print(problem)
             exit_code = 1
-        except StopIteration:
-            break
-        for q in problem:  # type: DisallowedImportAlias
-            print(q)
+    _import_cache.flush()
     return exit_code
 
 
@@ -2,13 +2,22 @@
 
 import ast
 import collections
+import contextlib
 import datetime as dt
+import hashlib
+import mmap
+import operator
 import os
+import re
+import sys
 from pathlib import Path
 from typing import (
+    AbstractSet,
     DefaultDict,
     Dict,
     Generator,
+    Iterator,
+    List,
     Mapping,
     NamedTuple,
     Optional,
@@ -18,14 +27,57 @@ from typing import (
 
 from typing_extensions import Buffer
 
+from allowed_import_aliases import _import_cache
+
 now_ = dt.datetime.now()
 
+# ``sys.stdout`` is ``None`` under pythonw and in some embedded interpreters.
+_isatty = getattr(sys.stdout, "isatty", None)
+_USE_COLOR = bool(_isatty and _isatty()) and "NO_COLOR" not in os.environ
+"""Whether error messages are colored with ANSI escape codes."""
+
+_TEMPLATES = {
+    True: (
+        "{path}:{ln}: \033[1;34m{qn}\033[0m is aliased as \033[1;31m{al}\033[0m."
+        " {allowed_msg}",
+        "The only allowed {noun} \033[1;32m{allowed}\033[0m",
+    ),
+    False: (
+        "{path}:{ln}: {qn} is aliased as {al}. {allowed_msg}",
+        "The only allowed {noun} {allowed}",
+    ),
+}
+"""Error message templates, with and without color."""
+
+_format_message, _format_allowed = (t.format for t in _TEMPLATES[_USE_COLOR])
+
+# Interned strings hash once and compare by identity in dict and set lookups.
+_intern = sys.intern
+
+# Bound once so the dispatch in ``get_imports_from_ast`` is a pointer comparison.
+_IMPORT = ast.Import
+_IMPORT_FROM = ast.ImportFrom
+
+_STATEMENT_LIST_FIELDS = ("body", "orelse", "finalbody", "handlers", "cases")
+"""The fields of ``ast`` nodes which may contain statements, and thus imports."""
 
-class AsName(NamedTuple):
+_IMPORT_KEYWORD = re.compile(rb"\bimport\b")
+"""Matches the ``import`` keyword, and also ``import`` in comments and strings."""
+
+_AS_KEYWORD = re.compile(rb"\bas\b")
+"""Matches the ``as`` keyword, and also ``as`` in comments, strings, and ``except``."""
+
+
+class AsName:
     """
     A container for import data parsed from a Python module's abstract syntax tree.
+
+    Instances compare equal to, and hash like, their alias, so a set of ``AsName``
+    behaves like a set of alias strings.
     """
 
+    __slots__ = ("qualname", "alias", "lineno")
+
     qualname: str
     """The fully-qualified name import name."""
 
@@ -35,7 +87,20 @@ class AsName(NamedTuple):
     lineno: int
     """The import statement's line number."""
 
+    def __init__(self, qualname: str, alias: str, lineno: int) -> None:
+        self.qualname = qualname
+        self.alias = alias
+        self.lineno = lineno
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(qualname={self.qualname!r},"
+            f" alias={self.alias!r}, lineno={self.lineno!r})"
+        )
+
     def __eq__(self, other: object) -> bool:
+        if isinstance(other, AsName):
+            return self.alias == other.alias
         return other == self.alias
 
     def __hash__(self) -> int:
@@ -51,16 +116,16 @@ def get_ast_from_filepath(filepath: Union[str, Path]) -> ast.AST:
     Returns:
         An abstract syntax tree of Python code.
     """
-    with open(filepath, "rt") as file:
-        return ast.parse(source=file.read(), filename=filepath)
+    with map_file(filepath) as buffer:
+        return ast.parse(source=buffer, filename=str(filepath))
 
 
 def get_ast_from_source(
-    source: Union[str, bytes], filename: Union[str, Buffer, os.PathLike]
+    source: Union[str, Buffer], filename: Union[str, Buffer, os.PathLike]
 ) -> ast.AST:
     """
     Args:
-        source (Union[str, bytes]):
+        source (Union[str, Buffer]):
             Bytes of Python code.
 
         filename (Union[str, bytes, None]):
@@ -80,61 +145,189 @@ def get_imports_from_ast(root: ast.AST) -> DefaultDict[str, Set[AsName]]:
 
     Returns:
         A DefaultDict with the fully-qualified string names of Python imports a keys
-        and a set of named tuples containing information parsed from the import using the abstract syntax tree.
+        and a set of ``AsName`` containing information parsed from the import using the abstract syntax tree.
     """
     imports = collections.defaultdict(set)
-    for node in ast.walk(root):
-        if isinstance(node, ast.Import):
+    # Import statements can only appear in the statement lists of other statements,
+    # so expressions are never descended into.
+    stack: List[ast.AST] = [root]
+    while stack:
+        node = stack.pop()
+        node_type = type(node)
+        if node_type is _IMPORT:
             module = ""
-        elif isinstance(node, ast.ImportFrom):
-            module = f"{node.module}."
+        elif node_type is _IMPORT_FROM:
+            module = f"{node.module}."  # type: ignore[attr-defined]
         else:
+            for field in reversed(_STATEMENT_LIST_FIELDS):
+                children = getattr(node, field, None)
+                if type(children) is list:
+                    stack.extend(reversed(children))
             continue
         for alias in node.names:  # type: ignore[attr-defined]
             if alias.asname:
-                qualname = f"{module}{alias.name}"
+                qualname = _intern(f"{module}{alias.name}")
                 imports[qualname].add(
-                    AsName(qualname=qualname, alias=alias.asname, lineno=node.lineno)
+                    AsName(
+                        qualname=qualname,
+                        alias=_intern(alias.asname),
+                        lineno=node.lineno,  # type: ignore[attr-defined]
+                    )
                 )
     return imports
 
 
+@contextlib.contextmanager
+def map_file(filepath: Union[str, Path]) -> Iterator[Buffer]:
+    """
+    Args:
+        filepath (Union[str, Path]):
+            The filepath to a Python module.
+
+    Yields:
+        A read-only memory map of the file, or empty bytes if the file is empty.
+    """
+    with open(filepath, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
+
+
+def may_contain_aliased_import(source: Buffer) -> bool:
+    """
+    Cheaply check whether Python code could contain an aliased import.
+
+    This is a filter, not a parser: false positives are possible, false negatives are not.
+
+    Args:
+        source (Buffer):
+            Bytes of Python code.
+
+    Returns:
+        ``False`` if the code certainly contains no aliased import.
+    """
+    # Every aliased import has an ``import`` keyword followed, eventually, by ``as``.
+    match = _IMPORT_KEYWORD.search(source)
+    return match is not None and _AS_KEYWORD.search(source, match.end()) is not None
+
+
+def get_imports_from_filepath(filepath: Union[str, Path]) -> Dict[str, Set[AsName]]:
+    """
+    Get the imports of a Python module, consulting the persistent import cache first.
+
+    Args:
+        filepath (Union[str, Path]):
+            The filepath to a Python module.
+
+    Returns:
+        A Dict with the fully-qualified string names of Python imports as keys
+        and a set of ``AsName`` containing information parsed from the import.
+    """
+    with map_file(filepath) as buffer:
+        if not may_contain_aliased_import(buffer):
+            return {}
+        return get_imports_from_buffer(buffer, filepath=filepath)
+
+
+def get_imports_from_buffer(
+    buffer: Buffer,
+    filepath: Union[str, Path],
+) -> Dict[str, Set[AsName]]:
+    """
+    Get the imports of a Python module's contents, consulting the persistent import cache first.
+
+    Args:
+        buffer (Buffer):
+            Bytes of Python code.
+
+        filepath (Union[str, Path]):
+            The filepath to the Python module.
+
+    Returns:
+        A Dict with the fully-qualified string names of Python imports as keys
+        and a set of ``AsName`` containing information parsed from the import.
+    """
+    sha256 = hashlib.sha256(buffer).digest()
+    imports = _import_cache.get(filepath, sha256)
+    if imports is None:
+        imports = get_imports_from_ast(
+            get_ast_from_source(source=buffer, filename=str(filepath))
+        )
+        _import_cache.put(filepath, sha256, imports)
+    return imports
+
+
 def format_error_message(
     filepath: str,
     qualname: str,
-    allowed_aliases: Optional[Set[str]],
+    allowed_aliases: Optional[AbstractSet[str]],
     actual_alias: AsName,
 ) -> str:
     if allowed_aliases:
-        _allowed: str = (
-            f"The only allowed alias{'es are' if len(allowed_aliases) > 1 else ' is'}"
-            f" \033[1;32m{allowed_aliases}\033[0m"
+        _allowed: str = _format_allowed(
+            noun="aliases are" if len(allowed_aliases) > 1 else "alias is",
+            allowed=f"{{{', '.join(map(repr, sorted(allowed_aliases)))}}}",
         )
     else:
         _allowed = "There are no allowed aliases."
 
-    return (
-        f"{filepath}:{actual_alias.lineno}:"
-        f" \033[1;34m{qualname}\033[0m"
-        f" is aliased as"
-        f" \033[1;31m{actual_alias.alias}\033[0m."
-        f" {_allowed}"
+    return _format_message(
+        path=filepath,
+        ln=actual_alias.lineno,
+        qn=qualname,
+        al=actual_alias.alias,
+        allowed_msg=_allowed,
     )
 
 
-class DisallowedImportAlias(Exception):
-    pass
+_lineno = operator.attrgetter("lineno")
+
+
+class DisallowedImportAlias(NamedTuple):
+    """
+    An import aliased other than as allowed.
+
+    These are yielded, never raised, so they are plain data rather than exceptions.
+    The error message is only formatted when ``str()`` is called.
+    """
+
+    filepath: str
+    """The filepath of the Python module containing the import."""
+
+    qualname: str
+    """The fully-qualified name import name."""
+
+    allowed_aliases: Optional[AbstractSet[str]]
+    """The import's allowed aliases."""
+
+    actual_alias: AsName
+    """The import's actual alias."""
+
+    @property
+    def message(self) -> str:
+        """The error message."""
+        return format_error_message(
+            filepath=self.filepath,
+            qualname=self.qualname,
+            allowed_aliases=self.allowed_aliases,
+            actual_alias=self.actual_alias,
+        )
+
+    def __str__(self) -> str:
+        return self.message
 
 
 def evaluate_file(
-    allowed_aliases: Mapping[str, Set[str]],
+    allowed_aliases: Mapping[str, AbstractSet[str]],
     filepath: Union[Path, str],
     *,
     lazy: bool = False,
 ) -> Generator[DisallowedImportAlias, None, None]:
     """
     Args:
-        allowed_aliases (Mapping[str, Set[str]]):
+        allowed_aliases (Mapping[str, AbstractSet[str]]):
             A mapping of imports to a set of allowed aliases.
 
         filepath (Union[Path, str]):
@@ -146,12 +339,14 @@ def evaluate_file(
     Return:
         A Generator of DisallowedImportAliases, each containing an error message string.
     """
-    root = get_ast_from_filepath(filepath=filepath)
-    yield from evaluate(allowed_aliases, root, filename=str(filepath), lazy=lazy)
+    imports = get_imports_from_filepath(filepath=filepath)
+    yield from evaluate_imports(
+        allowed_aliases, imports, filename=str(filepath), lazy=lazy
+    )
 
 
 def evaluate_source(
-    allowed_aliases: Dict[str, Set[str]],
+    allowed_aliases: Mapping[str, AbstractSet[str]],
     source: Union[str, bytes],
     *,
     filename: str = "<unknown>",
@@ -159,7 +354,7 @@ def evaluate_source(
 ) -> Generator[DisallowedImportAlias, None, None]:
     """
     Args:
-        allowed_aliases (Dict[str, Set[str]]):
+        allowed_aliases (Mapping[str, AbstractSet[str]]):
             A mapping of imports to a set of allowed aliases.
 
         source (Union[str, bytes]):
@@ -179,7 +374,7 @@ def evaluate_source(
 
 
 def evaluate(
-    allowed_aliases: Mapping[str, Set[str]],
+    allowed_aliases: Mapping[str, AbstractSet[str]],
     root: ast.AST,
     *,
     filename: str = "<unknown>",
@@ -187,7 +382,7 @@ def evaluate(
 ) -> Generator[DisallowedImportAlias, None, None]:
     """
     Args:
-        allowed_aliases (Dict[str, Set[str]]):
+        allowed_aliases (Mapping[str, AbstractSet[str]]):
             A mapping of imports to a set of allowed aliases.
 
         root (ast.AST):
@@ -203,33 +398,42 @@ def evaluate(
         A Generator of DisallowedImportAliases, each containing an error message string.
     """
     imports = get_imports_from_ast(root=root)
+    yield from evaluate_imports(allowed_aliases, imports, filename=filename, lazy=lazy)
+
+
+def evaluate_imports(
+    allowed_aliases: Mapping[str, AbstractSet[str]],
+    imports: Mapping[str, Set[AsName]],
+    *,
+    filename: str = "<unknown>",
+    lazy: bool = False,
+) -> Generator[DisallowedImportAlias, None, None]:
+    """
+    Args:
+        allowed_aliases (Mapping[str, AbstractSet[str]]):
+            A mapping of imports to a set of allowed aliases.
+
+        imports (Mapping[str, Set[AsName]]):
+            The imports of a Python module, as returned by ``get_imports_from_ast``.
+
+        filename (str):
+            Defaults to '<unknown>'.
+
+        lazy (bool):
+            Whether to break early. Defaults to ``False``.
+
+    Return:
+        A Generator of DisallowedImportAliases, each containing an error message string.
+    """
     for qualname, as_names in imports.items():
-        if as_names:
-            allowed = allowed_aliases.get(qualname)
-            if not allowed:
-                for actual in as_names:
-                    yield DisallowedImportAlias(
-                        format_error_message(
-                            filepath=filename,
-                            qualname=qualname,
-                            allowed_aliases=set(),
-                            actual_alias=actual,
-                        )
-                    )
-                    if lazy:
-                        return
-            else:
-                if allowed != as_names:
-                    for actual in as_names:
-                        for a in allowed:
-                            if a != actual:
-                                yield DisallowedImportAlias(
-                                    format_error_message(
-                                        filepath=filename,
-                                        qualname=qualname,
-                                        allowed_aliases=allowed,
-                                        actual_alias=actual,
-                                    )
-                                )
-                                if lazy:
-                                    return
+        allowed = allowed_aliases.get(qualname) or frozenset()
+        disallowed = [a for a in as_names if a.alias not in allowed]
+        for actual in sorted(disallowed, key=_lineno):
+            yield DisallowedImportAlias(
+                filepath=filename,
+                qualname=qualname,
+                allowed_aliases=allowed,
+                actual_alias=actual,
+            )
+            if lazy:
+                return
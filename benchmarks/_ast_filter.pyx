@@ -0,0 +1,37 @@
+# cython: language_level=3
+"""
+Optional compiled counterpart of ``measure._get_top_level_functions``.
+
+Build in place with ``cythonize -i benchmarks/_ast_filter.pyx``; ``measure`` falls back
+to its pure-Python filter when this extension has not been built.
+"""
+
+import ast
+
+from cpython.list cimport PyList_GET_ITEM, PyList_GET_SIZE
+
+
+cdef object _ClassDef = ast.ClassDef
+cdef object _FunctionDef = ast.FunctionDef
+cdef object _AsyncFunctionDef = ast.AsyncFunctionDef
+
+
+def top_level_defs(list body):
+    """
+    Filter a module's body to its {ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef}.
+
+    Args:
+        body (list):
+            The ``body`` of an ast.Module.
+    Returns:
+        A list; each item is an importable definition.
+    """
+    cdef Py_ssize_t i
+    cdef list out = []
+    cdef object item, t
+    for i in range(PyList_GET_SIZE(body)):
+        item = <object>PyList_GET_ITEM(body, i)
+        t = type(item)
+        if t is _ClassDef or t is _FunctionDef or t is _AsyncFunctionDef:
+            out.append(item)
+    return out
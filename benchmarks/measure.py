@@ -1,18 +1,32 @@
 """Benchmark serial, multithreaded, and multiprocessed file evaluation."""
 
+import argparse
+import array
 import ast
+import functools
+import hashlib
+import importlib.util
+import os
 import pathlib
-import pkgutil
+import pickle
+import re
+import statistics
 import sys
 import tempfile
+import warnings
+from collections import defaultdict, deque
+from itertools import chain
 from time import perf_counter_ns
 from typing import (
+    AbstractSet,
     Callable,
+    Dict,
     Generator,
     Iterable,
     Iterator,
     List,
     Mapping,
+    Optional,
     Set,
     Tuple,
     TypeVar,
@@ -20,10 +34,42 @@ from typing import (
 )
 
 import allowed_import_aliases
+from allowed_import_aliases.parse import (
+    AsName,
+    DisallowedImportAlias,
+    evaluate_imports,
+)
+
+try:
+    # Built from _ast_filter.pyx with ``cythonize -i benchmarks/_ast_filter.pyx``.
+    from _ast_filter import top_level_defs as _top_level_defs
+except ImportError:
+    _top_level_defs = None
 
 R = TypeVar("R")
 
 
+_CACHE_DIR = pathlib.Path(os.path.expanduser("~/.cache/aia-bench"))
+"""Where results which are stable across benchmark runs are persisted."""
+
+_FREE_THREADED: bool = getattr(sys, "_is_gil_enabled", lambda: True)() is False
+"""Whether this interpreter is a free-threaded build running with the GIL disabled."""
+
+_TEMP_BASE: Optional[str] = (
+    "/dev/shm"
+    if sys.platform.startswith("linux") and os.path.isdir("/dev/shm")
+    else None
+)
+"""
+Where temporary packages are built. On Linux this is RAM-backed tmpfs, so timings do not
+depend on the disk. Each module holds about ``imports * 50`` bytes in memory, although
+modules linked to ``module_0.py`` share its storage.
+"""
+
+_IMPORTS_CACHE_VERSION = 2
+"""Incremented whenever ``build_imports_from_builtins`` changes what it produces."""
+
+
 def parse_ast(filepath: str) -> ast.Module:
     """
     Parse a Python file.
@@ -34,40 +80,34 @@ def parse_ast(filepath: str) -> ast.Module:
     Returns:
         A parsed ast.Module.
     """
-    with open(filepath, "rt") as file:
-        return ast.parse(file.read(), filename=filepath)
+    return ast.parse(pathlib.Path(filepath).read_bytes(), filename=filepath)
+
+
+_IMPORTABLE_TYPES = frozenset((ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef))
+"""Statement types which define an importable name; ``ast`` nodes are never subclassed."""
 
 
 def _get_top_level_functions(
     body: Iterable[ast.stmt],
-) -> Generator[Union[ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef], None, None]:
+) -> List[Union[ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef]]:
     """
-    Yield ast.stmt if they are one of {ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef}.
+    Filter ast.stmt to those which are one of {ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef}.
 
     Args:
         body:
             An iterable of ast.stmt
 
     Returns:
-        A generator; each item is an importable definition.
+        A list; each item is an importable definition.
     """
-    return (
-        item
-        for item in body
-        if isinstance(
-            item,
-            (
-                ast.ClassDef,
-                ast.FunctionDef,
-                ast.AsyncFunctionDef,
-            ),
-        )
-    )
+    if _top_level_defs is not None and type(body) is list:
+        return _top_level_defs(body)
+    return [item for item in body if type(item) in _IMPORTABLE_TYPES]  # type: ignore[misc]
 
 
 def get_importables_from_module(
     filepath: str,
-) -> Generator[Union[ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef], None, None]:
+) -> Tuple[Union[ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef], ...]:
     """
 
     Args:
@@ -77,8 +117,30 @@ def get_importables_from_module(
     Returns:
         A Python module's importable definitions.
     """
-    tree = parse_ast(filepath)
-    yield from _get_top_level_functions(tree.body)
+    return tuple(_get_top_level_functions(parse_ast(filepath).body))
+
+
+def _find_source(module: str) -> Optional[Tuple[str, str]]:
+    """
+    Locate Python source for a builtin module. Builtin modules have no source of their
+    own, but many are wrapped by a module named without their leading underscores.
+
+    Args:
+        module (str):
+            The name of a builtin module.
+    Returns:
+        The name and source filepath of ``module`` or of its pure-Python counterpart,
+        or ``None`` if neither is a ``.py`` file.
+    """
+    for name in dict.fromkeys((module, module.lstrip("_"))):
+        try:
+            spec = importlib.util.find_spec(name)
+        except (ImportError, ValueError):
+            continue
+        origin = getattr(spec, "origin", None)
+        if origin is not None and origin.endswith(".py"):
+            return name, origin
+    return None
 
 
 def build_imports_from_builtins() -> List[Tuple[str, str, str]]:
@@ -89,11 +151,11 @@ def build_imports_from_builtins() -> List[Tuple[str, str, str]]:
         A list of tuples containing an import statement, an allowed import alias, and a disallowed import alias.
     """
     imports = []
-    for module in sys.builtin_module_names:
-        module = module.lstrip("_")
-        filepath = pkgutil.get_loader(module)
-        if filepath is not None:
-            for stmt in get_importables_from_module(filepath.path):  # type: ignore[attr-defined]
+    for builtin in sys.builtin_module_names:
+        source = _find_source(builtin)
+        if source is not None:
+            module, path = source
+            for stmt in get_importables_from_module(path):
                 imports.append(
                     (
                         f"import {module}.{stmt.name}",  # import statement
@@ -104,25 +166,150 @@ def build_imports_from_builtins() -> List[Tuple[str, str, str]]:
     return imports
 
 
-_IMPORTS: List[Tuple[str, str, str]] = build_imports_from_builtins()
+def load_imports_from_builtins() -> List[Tuple[str, str, str]]:
+    """
+    Load the result of ``build_imports_from_builtins`` from ``_CACHE_DIR``,
+    building and persisting it if this interpreter has not been seen before.
+
+    Returns:
+        A list of tuples containing an import statement, an allowed import alias, and a disallowed import alias.
+    """
+    key = hashlib.sha256(
+        repr((_IMPORTS_CACHE_VERSION, sys.version, sys.builtin_module_names)).encode()
+    ).hexdigest()
+    path = _CACHE_DIR / f"imports-{key}.pkl"
+    try:
+        with path.open("rb") as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass
+    imports = build_imports_from_builtins()
+    try:
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as f:
+            pickle.dump(imports, f)
+    except OSError:
+        pass
+    return imports
+
+
+_IMPORTS: List[Tuple[str, str, str]] = load_imports_from_builtins()
+
+
+def _build_payload(imports: Iterable[Tuple[str, str, str]]) -> bytes:
+    """
+    Args:
+        imports:
+            Tuples containing an import statement, an allowed import alias, and a disallowed import alias.
+    Returns:
+        The contents of a module which imports each of ``imports`` using its disallowed alias.
+    """
+    return b"".join(
+        f"{import_statement} {bad_alias}\n".encode()
+        for import_statement, _, bad_alias in imports
+    )
+
+
+_IMPORT_COUNTS: Tuple[int, ...] = tuple(2**m for m in range(9))
+"""The numbers of imports per module which ``run_benchmarks`` measures."""
+
+_PAYLOADS: Dict[int, bytes] = {
+    imports: _build_payload(_IMPORTS[:imports]) for imports in _IMPORT_COUNTS
+}
+"""Module contents keyed by the number of leading ``_IMPORTS`` which they contain."""
+
+
+def _get_payload(imports: int) -> bytes:
+    """
+    Args:
+        imports (int):
+            The number of leading ``_IMPORTS`` for the module to contain.
+    Returns:
+        The contents of a module which imports each of ``_IMPORTS[:imports]``;
+        those for ``_IMPORT_COUNTS`` are built at import time and others on demand.
+    """
+    try:
+        return _PAYLOADS[imports]
+    except KeyError:
+        payload = _PAYLOADS[imports] = _build_payload(_IMPORTS[:imports])
+        return payload
+
+
+def _write_payload(filepath: str, payload: bytes) -> None:
+    """
+    Write ``payload`` to ``filepath`` without going through Python's buffered I/O layers.
+
+    Args:
+        filepath (str):
+            The filepath of the file to create or overwrite.
+        payload (bytes):
+            The file's new contents.
+    """
+    fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+
+
+def _link_module(directory: str, i: int) -> bool:
+    """
+    Create module ``i`` of a temporary package as a hard link to ``module_0.py``, or a
+    symbolic link where hard links are unsupported. Every module has the same contents,
+    so only ``module_0.py`` needs to be written in full.
+
+    Args:
+        directory (str):
+            The directory of a temporary package.
+        i (int):
+            The index of the module to create.
+
+    Returns:
+        Whether a link could be created.
+    """
+    base = os.path.join(directory, "module_0.py")
+    filepath = os.path.join(directory, f"module_{i}.py")
+    for clone in (os.link, os.symlink):
+        try:
+            clone(base, filepath)
+        except OSError:
+            continue
+        return True
+    return False
+
+
+def _write_package_modules(directory: str, indices: range, payload: bytes) -> None:
+    """
+    Write a module containing ``payload`` to ``directory`` for each of ``indices``.
+    Linking is a single metadata operation per module, so it is done inline; ``payload``
+    is only written for ``module_0.py`` and for modules which cannot be linked.
+
+    Args:
+        directory (str):
+            The directory of a temporary package.
+        indices (range):
+            The indices of the modules to write.
+        payload (bytes):
+            The contents of each module.
+    """
+    for i in indices:
+        if i == 0 or not _link_module(directory, i):
+            # The first module must exist before any other can be linked to it.
+            _write_payload(os.path.join(directory, f"module_{i}.py"), payload)
 
 
 def build_temp_package(max_modules: int = 1000) -> Generator[str, None, None]:
     """
     Construct a Python package containing ``max_modules`` number of modules.
     """
-    with tempfile.TemporaryDirectory() as temporary_directory:
-        with pathlib.Path(temporary_directory, "__init__.py").open("w") as f:
-            f.write("\n")
+    with tempfile.TemporaryDirectory(dir=_TEMP_BASE) as temporary_directory:
+        _write_payload(os.path.join(temporary_directory, "__init__.py"), b"\n")
 
-        for i in range(max_modules):
-            with pathlib.Path(temporary_directory, f"module_{i}.py").open("w") as f:
-                f.writelines(
-                    (
-                        f"{import_statement} {bad_alias}\n"
-                        for import_statement, _, bad_alias in _IMPORTS
-                    )
-                )
+        _write_package_modules(
+            temporary_directory, range(max_modules), _get_payload(len(_IMPORTS))
+        )
         yield temporary_directory
 
 
@@ -132,22 +319,42 @@ class BuildTempPackage:
     """
 
     def _write_modules(self, modules: int, imports: int):
-        with pathlib.Path(self.td.name, "__init__.py").open("w") as f:
-            f.write("\n")
+        _write_payload(os.path.join(self.td.name, "__init__.py"), b"\n")
 
-        for i in range(modules):
-            with pathlib.Path(self.td.name, f"module_{i}.py").open("w") as f:
-                f.writelines(
-                    (
-                        f"{import_statement} {bad_alias}\n"
-                        for import_statement, _, bad_alias in _IMPORTS[:imports]
-                    )
-                )
+        _write_package_modules(self.td.name, range(modules), _get_payload(imports))
 
     def __init__(self, modules: int, imports: int):
-        self.td = tempfile.TemporaryDirectory()
+        self.td = tempfile.TemporaryDirectory(dir=_TEMP_BASE)
+        self.modules = modules
+        self.imports = imports
+        self._filepaths: Optional[List[str]] = None
         self._write_modules(modules=modules, imports=imports)
 
+    @property
+    def filepaths(self) -> List[str]:
+        """
+        Returns:
+            The filepaths of the package's Python modules, listed once per package size.
+        """
+        if self._filepaths is None:
+            self._filepaths = _list_modules(self.td.name)
+        return self._filepaths
+
+    def extend(self, modules: int) -> None:
+        """
+        Grow the package to ``modules`` number of modules, leaving existing modules in place.
+
+        Args:
+            modules (int):
+                The number of modules which the package should contain.
+        """
+        _write_package_modules(
+            self.td.name, range(self.modules, modules), _get_payload(self.imports)
+        )
+        if modules > self.modules:
+            self.modules = modules
+            self._filepaths = None
+
     def __enter__(self):
         return self
 
@@ -155,16 +362,43 @@ class BuildTempPackage:
         self.td.cleanup()
 
 
+def _list_modules(directory: str) -> List[str]:
+    """
+    Args:
+        directory (str):
+            The directory of a temporary package.
+    Returns:
+        The filepaths of the Python modules directly under ``directory``.
+    """
+    with os.scandir(directory) as entries:
+        return [
+            entry.path
+            for entry in entries
+            if entry.name.endswith(".py") and entry.is_file()
+        ]
+
+
+_MIN_BENCHMARK_NS = 100_000_000
+"""Handlers are run repeatedly until their timings add up to at least this long."""
+
+
 def benchmark(
     handler: Callable[
-        [Mapping[str, Set[str]], Iterable[Union[pathlib.Path, str]]], Iterator[R]
+        [Mapping[str, Set[str]], Iterable[Union[pathlib.Path, str]]],
+        Iterator[Iterable[R]],
     ],
     allowed_aliases: Mapping[str, Set[str]],
     filenames: Iterable[Union[pathlib.Path, str]],
-) -> Tuple[str, int]:
+) -> Tuple[str, int, int]:
     """
     Time the execution of a file evaluator.
 
+    After one untimed warm-up run, which absorbs one-off costs such as starting a
+    worker pool, the handler is run at least twice and until ``_MIN_BENCHMARK_NS``
+    have elapsed, so that sub-millisecond timings are not dominated by noise. Each
+    file's results are consumed inside the timed region, because handlers such as
+    ``_serial`` only parse and check a file once its results are iterated.
+
     Args:
         handler:
             A Callable wrapping the evaluate_files function.
@@ -173,49 +407,179 @@ def benchmark(
         filenames:
             Python files to evaluate.
     Returns:
-
+        The handler's name, and the mean and standard deviation of its run time in nanoseconds.
     """
-    start = perf_counter_ns()
-    for _ in handler(allowed_aliases, filenames):
-        pass
-    stop = perf_counter_ns()
+    filenames = list(filenames)
+    deque(chain.from_iterable(handler(allowed_aliases, filenames)), maxlen=0)
+    timings: List[int] = []
+    total = 0
+    while total < _MIN_BENCHMARK_NS or len(timings) < 2:
+        start = perf_counter_ns()
+        deque(chain.from_iterable(handler(allowed_aliases, filenames)), maxlen=0)
+        stop = perf_counter_ns()
+        timings.append(stop - start)
+        total += stop - start
     return (
         handler.__name__,
-        stop - start,
+        round(statistics.mean(timings)),
+        round(statistics.stdev(timings)),
+    )
+
+
+_IMPORT_RE = re.compile(
+    rb"^(?:import\s+([\w.]+)|from\s+([\w.]+)\s+import\s+(\w+))\s+as\s+(\w+)\s*$",
+    re.MULTILINE,
+)
+"""Matches a single-line aliased import, as written to every temporary module."""
+
+
+def fast_parse(filepath: Union[pathlib.Path, str]) -> Dict[str, Set[AsName]]:
+    """
+    Extract aliased imports using ``_IMPORT_RE`` rather than an abstract syntax tree.
+
+    Only suitable for modules like those written by ``BuildTempPackage``, where every
+    aliased import is a single line of its own.
+
+    Args:
+        filepath:
+            The filepath of a file to parse.
+    Returns:
+        The same mapping of qualified names to ``AsName`` as ``get_imports_from_ast``.
+    """
+    source = pathlib.Path(filepath).read_bytes()
+    imports: Dict[str, Set[AsName]] = defaultdict(set)
+    lineno, position = 1, 0
+    for match in _IMPORT_RE.finditer(source):
+        lineno += source.count(b"\n", position, match.start())
+        position = match.start()
+        module, package, name, alias = match.groups()
+        qualname = module if module is not None else package + b"." + name
+        imports[qualname.decode()].add(
+            AsName(qualname=qualname.decode(), alias=alias.decode(), lineno=lineno)
+        )
+    return imports
+
+
+def _fast_evaluate_file(
+    allowed_aliases: Mapping[str, AbstractSet[str]],
+    filepath: Union[pathlib.Path, str],
+) -> Generator[DisallowedImportAlias, None, None]:
+    """
+    Evaluate a file parsed with ``fast_parse``. Like ``evaluate_file``, the file is
+    only read once the generator is iterated.
+
+    Args:
+        allowed_aliases:
+            Key-value pair of fully-qualified name and one or more acceptable aliases.
+        filepath:
+            A Python file to evaluate.
+    Returns:
+        A Generator of ``DisallowedImportAlias`` instances, parsed with ``fast_parse``.
+    """
+    yield from evaluate_imports(
+        allowed_aliases, fast_parse(filepath), filename=str(filepath)
     )
 
 
-def run_benchmarks() -> Generator[Tuple[Tuple[str, int], int, int], None, None]:
-    handlers = (
+def _fast_serial(
+    allowed_aliases: Mapping[str, AbstractSet[str]],
+    filenames: Iterable[Union[pathlib.Path, str]],
+) -> Iterator[Generator[DisallowedImportAlias, None, None]]:
+    """
+    Evaluate files serially, parsing them with ``fast_parse``.
+
+    This is the counterpart of ``main._serial``: both return one lazy generator per
+    file, which ``benchmark`` consumes in full, and both report problems through
+    ``evaluate_imports``. They differ only in how each file is read and parsed, so
+    the gap between them is the cost of the prefilter and ``ast.parse``.
+
+    Args:
+        allowed_aliases:
+            Key-value pair of fully-qualified name and one or more acceptable aliases.
+        filenames:
+            Python files to evaluate.
+    Returns:
+        An Iterator of Generators, each producing ``DisallowedImportAlias`` instances.
+    """
+    return (_fast_evaluate_file(allowed_aliases, filename) for filename in filenames)
+
+
+def run_benchmarks(
+    fast: bool = False,
+) -> Generator[Tuple[Tuple[str, int, int], int, int], None, None]:
+    # The import cache would turn every timed repeat after the warm-up into lookups,
+    # and would fill the user's cache with rows for temporary paths. Worker processes
+    # inherit the setting, since the pools are started after it is made.
+    os.environ["AIA_NO_CACHE"] = "1"
+    handlers = [
         allowed_import_aliases.main._serial,
-        allowed_import_aliases.main._multithread,
         allowed_import_aliases.main._multiprocess,
-    )
-    for modules in (2**m for m in range(11)):  # type: int
-        for imports in (2**m for m in range(9)):  # type: int
-            with BuildTempPackage(modules=modules, imports=imports) as temp_package:
-                filepaths = pathlib.Path(temp_package.td.name).glob(pattern="*.py")
+        allowed_import_aliases.main._multi_interpreter,
+    ]
+    if fast:
+        handlers.insert(1, _fast_serial)
+    # Parsing is CPU-bound, so threads only run in parallel on a free-threaded build.
+    if _FREE_THREADED or os.environ.get("AIA_BENCH_THREADS") == "1":
+        if not _FREE_THREADED:
+            warnings.warn(
+                "benchmarking _multithread with the GIL enabled; "
+                "its threads cannot parse modules in parallel",
+                RuntimeWarning,
+            )
+        handlers.insert(1, allowed_import_aliases.main._multithread)
+    # Larger packages are supersets of smaller ones with the same number of imports,
+    # so each package is built once per number of imports and grown in place.
+    for imports in _IMPORT_COUNTS:
+        with BuildTempPackage(modules=0, imports=imports) as temp_package:
+            for modules in (2**m for m in range(11)):  # type: int
+                temp_package.extend(modules)
                 for handler in handlers:
                     result = benchmark(
                         # https://github.com/python/mypy/issues/14661
                         handler,  # type: ignore[arg-type]
                         allowed_aliases={},
-                        filenames=filepaths,
+                        filenames=temp_package.filepaths,
                     )
                     yield result, modules, imports
 
 
-def plot_sns(results: Iterable[Tuple[Tuple[str, int], int, int]]):
-    import matplotlib.pyplot as plt
+def _to_frame(results: Iterable[Tuple[Tuple[str, int, int], int, int]]):
+    """
+    Args:
+        results:
+            The benchmark results yielded by ``run_benchmarks``.
+    Returns:
+        A pandas.DataFrame with one row per result, built column by column.
+    """
+    import numpy as np
     import pandas as pd
+
+    parallelization: List[str] = []
+    nanoseconds = array.array("q")
+    num_modules = array.array("q")
+    num_imports = array.array("q")
+    for (name, mean, _), modules, imports in results:
+        parallelization.append(name[1:])
+        nanoseconds.append(mean)
+        num_modules.append(modules)
+        num_imports.append(imports)
+    return pd.DataFrame(
+        {
+            "parallelization": parallelization,
+            "nanoseconds": np.frombuffer(nanoseconds, dtype=np.int64),
+            "num_modules": np.frombuffer(num_modules, dtype=np.int64),
+            "num_imports": np.frombuffer(num_imports, dtype=np.int64),
+        }
+    )
+
+
+def plot_sns(results: Iterable[Tuple[Tuple[str, int, int], int, int]]):
+    import matplotlib.pyplot as plt
     import seaborn as sns
 
     sns.set_theme(rc={"figure.figsize": (12, 6)})
 
-    data = pd.DataFrame(
-        data=((r[0][0][1:], r[0][1], r[1], r[2]) for r in results),
-        columns=["parallelization", "nanoseconds", "num_modules", "num_imports"],
-    )
+    data = _to_frame(results)
 
     figure, axes = plt.subplots(ncols=2)
 
@@ -244,14 +608,10 @@ def plot_sns(results: Iterable[Tuple[Tuple[str, int], int, int]]):
     figure.savefig("./output/measure.svg")
 
 
-def plot_plotly(results: Iterable[Tuple[Tuple[str, int], int, int]]):
-    import pandas as pd
+def plot_plotly(results: Iterable[Tuple[Tuple[str, int, int], int, int]]):
     import plotly.express as px
 
-    data = pd.DataFrame(
-        data=((r[0][0][1:], r[0][1], r[1], r[2]) for r in results),
-        columns=["parallelization", "nanoseconds", "num_modules", "num_imports"],
-    )
+    data = _to_frame(results)
 
     figure = px.scatter_3d(
         data_frame=data,
@@ -280,4 +640,12 @@ def plot_plotly(results: Iterable[Tuple[Tuple[str, int], int, int]]):
 
 
 if __name__ == "__main__":
-    plot_plotly(run_benchmarks())
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="also benchmark _fast_serial, which parses imports with a regular"
+        " expression, against the AST-based _serial",
+    )
+    args = parser.parse_args()
+    plot_plotly(run_benchmarks(fast=args.fast))
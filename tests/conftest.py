@@ -0,0 +1,11 @@
+import pytest
+
+from allowed_import_aliases import _import_cache
+
+
+@pytest.fixture(autouse=True)
+def import_cache_dir(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("AIA_CACHE_DIR", str(cache_dir))
+    yield cache_dir
+    _import_cache._pending.clear()
@@ -0,0 +1,82 @@
+import ast
+import sys
+
+import allowed_import_aliases
+from allowed_import_aliases import _import_cache
+
+
+def test_get_cache_path(import_cache_dir):
+    assert _import_cache.get_cache_path().parent == import_cache_dir
+
+
+def test_get_miss(tmp_path):
+    assert _import_cache.get(tmp_path / "test.py", b"\x00" * 32) is None
+
+
+def test_put_get(tmp_path):
+    filepath = tmp_path / "test.py"
+    as_name = allowed_import_aliases.parse.AsName(
+        qualname="pandas",
+        alias="pd",
+        lineno=1,
+    )
+    _import_cache.put(filepath, b"\x00" * 32, {"pandas": {as_name}})
+    assert _import_cache.get(filepath, b"\x00" * 32) == {"pandas": {"pd"}}
+    assert _import_cache.get(filepath, b"\x01" * 32) is None
+
+
+def test_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("AIA_NO_CACHE", "1")
+    filepath = tmp_path / "test.py"
+    _import_cache.put(filepath, b"\x00" * 32, {})
+    assert _import_cache.get(filepath, b"\x00" * 32) is None
+
+
+def test_evaluate_file_cache_hit_skips_parse(tmp_path, monkeypatch):
+    filepath = tmp_path / "test.py"
+    with filepath.open("w") as f:
+        f.write("import pandas as pa\n")
+    assert len(tuple(allowed_import_aliases.parse.evaluate_file({}, filepath))) == 1
+
+    def _parse(*args, **kwargs):
+        raise AssertionError("ast.parse should not be called on a cache hit")
+
+    monkeypatch.setattr(ast, "parse", _parse)
+    assert len(tuple(allowed_import_aliases.parse.evaluate_file({}, filepath))) == 1
+
+
+def test_evaluate_file_cache_miss_on_change(tmp_path):
+    filepath = tmp_path / "test.py"
+    with filepath.open("w") as f:
+        f.write("import pandas as pa\n")
+    assert len(tuple(allowed_import_aliases.parse.evaluate_file({}, filepath))) == 1
+    with filepath.open("w") as f:
+        f.write("import pandas\n")
+    assert len(tuple(allowed_import_aliases.parse.evaluate_file({}, filepath))) == 0
+
+
+def test_cache_path_is_versioned():
+    name = _import_cache.get_cache_path().name
+    assert f"py{sys.version_info[0]}.{sys.version_info[1]}" in name
+    assert _import_cache._parser_digest() in name
+
+
+def test_flush_batches_writes(tmp_path, import_cache_dir):
+    filepath = tmp_path / "test.py"
+    _import_cache.put(filepath, b"\x00" * 32, {})
+    assert not _import_cache.get_cache_path().exists()
+    _import_cache.flush()
+    _import_cache._pending.clear()
+    assert _import_cache.get(filepath, b"\x00" * 32) == {}
+
+
+def test_prune(tmp_path, monkeypatch):
+    monkeypatch.setattr(_import_cache, "_MAX_ROWS", 4)
+    existing = tmp_path / "existing.py"
+    existing.touch()
+    for i in range(4):
+        _import_cache.put(tmp_path / f"deleted_{i}.py", b"\x00" * 32, {})
+    _import_cache.put(existing, b"\x00" * 32, {})
+    _import_cache.flush()
+    assert _import_cache.get(existing, b"\x00" * 32) == {}
+    assert _import_cache.get(tmp_path / "deleted_0.py", b"\x00" * 32) is None
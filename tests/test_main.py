@@ -0,0 +1,248 @@
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import allowed_import_aliases
+
+
+def _write_modules(tmp_path, count):
+    filepaths = []
+    for i in range(count):
+        filepath = tmp_path / f"module_{i}.py"
+        with filepath.open("w") as f:
+            f.write("import pandas as pa\nimport numpy as np\n")
+        filepaths.append(filepath)
+    return filepaths
+
+
+def test_multiprocess(tmp_path):
+    filepaths = _write_modules(tmp_path, 9)
+    problems = allowed_import_aliases.main._multiprocess(
+        allowed_aliases={"pandas": {"pd"}, "numpy": {"np"}},
+        filenames=filepaths,
+        max_workers=2,
+    )
+    assert [len(list(p)) for p in problems] == [1] * 9
+
+
+def test_main_exit_code(tmp_path):
+    filepaths = [str(filepath) for filepath in _write_modules(tmp_path, 1)]
+    assert allowed_import_aliases.main.main([*filepaths, "-a", "pandas pa"]) == 1
+    assert (
+        allowed_import_aliases.main.main(
+            [*filepaths, "-p", "0", "-a", "pandas pa", "-a", "numpy np"]
+        )
+        == 0
+    )
+
+
+def test_get_pool_is_persistent():
+    pool = allowed_import_aliases.main._get_pool("thread", 1, {})
+    assert allowed_import_aliases.main._get_pool("thread", 1, {}) is pool
+    assert allowed_import_aliases.main._get_pool("thread", 2, {}) is not pool
+
+
+def test_get_pool_keyed_by_allowed_aliases_for_processes():
+    pool = allowed_import_aliases.main._get_pool("process", 1, {"pandas": {"pd"}})
+    assert (
+        allowed_import_aliases.main._get_pool("process", 1, {"pandas": {"pd"}}) is pool
+    )
+    assert (
+        allowed_import_aliases.main._get_pool("process", 1, {"pandas": {"pa"}})
+        is not pool
+    )
+
+
+def test_get_pool_replaces_previous_pool():
+    pool = allowed_import_aliases.main._get_pool("process", 1, {"pandas": {"pd"}})
+    replacement = allowed_import_aliases.main._get_pool(
+        "process", 1, {"pandas": {"pa"}}
+    )
+    assert replacement is not pool
+    with pytest.raises(RuntimeError):
+        pool.submit(int)
+    assert allowed_import_aliases.main._pools["process"][1] is replacement
+
+
+def test_serial_skips_files_without_aliased_imports(tmp_path):
+    filepaths = _write_modules(tmp_path, 2)
+    clean = tmp_path / "clean.py"
+    with clean.open("w") as f:
+        f.write("import pandas\nclass A:\n    pass\n")
+    empty = tmp_path / "empty.py"
+    empty.touch()
+    problems = allowed_import_aliases.main._serial(
+        allowed_aliases={"numpy": {"np"}},
+        filenames=[filepaths[0], clean, empty, filepaths[1]],
+    )
+    assert [len(list(p)) for p in problems] == [1, 0, 0, 1]
+
+
+def test_read_ahead(tmp_path):
+    filepaths = _write_modules(tmp_path, 5)
+    clean = tmp_path / "clean.py"
+    with clean.open("w") as f:
+        f.write("import pandas\n")
+    sources = dict(allowed_import_aliases.main._read_ahead([*filepaths, clean], 1))
+    assert sorted(sources) == sorted(str(filepath) for filepath in filepaths)
+    assert set(sources.values()) == {b"import pandas as pa\nimport numpy as np\n"}
+
+
+def test_read_ahead_preserves_order(tmp_path):
+    filepaths = _write_modules(tmp_path, 64)
+    clean = tmp_path / "clean.py"
+    with clean.open("w") as f:
+        f.write("import pandas\n")
+    filenames = [*filepaths[::-1], clean, *filepaths[:8]]
+    sources = allowed_import_aliases.main._read_ahead(filenames, 1)
+    assert [filepath for filepath, _ in sources] == [
+        str(filepath) for filepath in [*filepaths[::-1], *filepaths[:8]]
+    ]
+
+
+def test_read_ahead_missing_file(tmp_path):
+    filepaths = _write_modules(tmp_path, 5)
+    with pytest.raises(FileNotFoundError):
+        list(
+            allowed_import_aliases.main._read_ahead(
+                [*filepaths, tmp_path / "missing.py"], 1
+            )
+        )
+
+
+def test_as_completed_chunks_bounds_read_ahead(tmp_path, monkeypatch):
+    reads = []
+
+    def _read_source(filename):
+        reads.append(filename)
+        return read_source(filename)
+
+    read_source = allowed_import_aliases.main._read_source
+    monkeypatch.setattr(allowed_import_aliases.main, "_read_source", _read_source)
+    filepaths = _write_modules(tmp_path, 64)
+    sources = allowed_import_aliases.main._read_ahead(filepaths, 1)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        results = allowed_import_aliases.main._as_completed_chunks(
+            executor, list, sources, chunksize=1, max_pending=2
+        )
+        next(results)
+        time.sleep(0.2)
+        assert len(reads) < 16
+        results.close()
+        sources.close()
+
+
+def test_multi_interpreter(tmp_path):
+    filepaths = _write_modules(tmp_path, 4)
+    problems = allowed_import_aliases.main._multi_interpreter(
+        allowed_aliases={"pandas": {"pd"}, "numpy": {"np"}},
+        filenames=filepaths,
+        max_workers=2,
+    )
+    problems = list(problems)
+    assert [len(p) for p in problems] == [1] * 4
+    assert all(isinstance(message, str) for p in problems for message in p)
+
+
+def test_validate_args_mutually_exclusive():
+    with pytest.raises(ValueError):
+        allowed_import_aliases.main._validate_args(t=[1], p=None, i=[1])
+    assert allowed_import_aliases.main._validate_args(t=None, p=None, i=[2]) == (
+        None,
+        None,
+        2,
+    )
+
+
+def test_main_continues_after_clean_file(tmp_path):
+    clean = tmp_path / "clean.py"
+    with clean.open("w") as f:
+        f.write("import pandas as pd\n")
+    filepaths = [str(clean), *(str(p) for p in _write_modules(tmp_path, 1))]
+    for option in ([], ["-t", "2"], ["-p", "1"], ["-i", "1"]):
+        assert (
+            allowed_import_aliases.main.main([*filepaths, *option, "-a", "pandas pd"])
+            == 1
+        )
+
+
+def test_chunks():
+    assert list(allowed_import_aliases.main._chunks(range(5), 2)) == [
+        [0, 1],
+        [2, 3],
+        [4],
+    ]
+    assert list(allowed_import_aliases.main._chunks([], 2)) == []
+
+
+def test_main_prints_only_problems(tmp_path, capsys):
+    filepaths = [str(filepath) for filepath in _write_modules(tmp_path, 1)]
+    allowed_import_aliases.main.main([*filepaths, "-a", "pandas pa", "-a", "numpy np"])
+    assert capsys.readouterr().out == ""
+
+
+def test_longest_first():
+    files = [(f"module_{i}.py", size) for i, size in enumerate((1, 3, 2, 5, 4))]
+    longest_first = allowed_import_aliases.main._longest_first
+    assert longest_first(files, max_workers=1) == [
+        files[3],
+        files[4],
+        files[1],
+        files[2],
+        files[0],
+    ]
+    assert longest_first(files, max_workers=4) == files
+
+
+def test_expand(tmp_path):
+    (tmp_path / "package" / "sub").mkdir(parents=True)
+    (tmp_path / "package" / "a.py").write_bytes(b"x = 1\n")
+    (tmp_path / "package" / "sub" / "b.py").write_bytes(b"")
+    (tmp_path / "package" / "sub" / "c.txt").write_bytes(b"")
+    (tmp_path / "d.py").write_bytes(b"import os\n")
+    files = allowed_import_aliases.main._expand(
+        [tmp_path / "package", str(tmp_path / "d.py")], sizes=True
+    )
+    assert sorted(files) == [
+        (str(tmp_path / "d.py"), 10),
+        (str(tmp_path / "package" / "a.py"), 6),
+        (str(tmp_path / "package" / "sub" / "b.py"), 0),
+    ]
+    files = allowed_import_aliases.main._expand([tmp_path / "package"])
+    assert sorted(files) == [
+        (str(tmp_path / "package" / "a.py"), 0),
+        (str(tmp_path / "package" / "sub" / "b.py"), 0),
+    ]
+
+
+def test_main_directory(tmp_path):
+    _write_modules(tmp_path, 2)
+    assert allowed_import_aliases.main.main([str(tmp_path), "-a", "pandas pa"]) == 1
+
+
+def test_build_parser_is_cached():
+    assert (
+        allowed_import_aliases.main._build_parser()
+        is allowed_import_aliases.main._build_parser()
+    )
+
+
+def test_nonneg_int():
+    assert allowed_import_aliases.main._nonneg_int("0") == 0
+    with pytest.raises(argparse.ArgumentTypeError):
+        allowed_import_aliases.main._nonneg_int("-1")
+    with pytest.raises(argparse.ArgumentTypeError):
+        allowed_import_aliases.main._nonneg_int("one")
+
+
+def test_nonneg_int_error_message(capsys):
+    with pytest.raises(SystemExit):
+        allowed_import_aliases.main.main(["-p", "-1"])
+    err = capsys.readouterr().err
+    assert "_nonneg_int" not in err
+    assert "-1 is not between 0 and" in err
+    with pytest.raises(argparse.ArgumentTypeError):
+        allowed_import_aliases.main._nonneg_int(str((os.cpu_count() or 0) + 1))
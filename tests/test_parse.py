@@ -1,4 +1,7 @@
 import ast
+import pickle
+import subprocess
+import sys
 
 import allowed_import_aliases
 
@@ -259,3 +262,250 @@ def test_format_error_message():
         actual_alias=as_name,
     )
     assert isinstance(message, str)
+
+
+def test_evaluate_file_empty(tmp_path):
+    p = tmp_path / "test.py"
+    p.touch()
+    evaluations = tuple(
+        allowed_import_aliases.parse.evaluate_file(
+            allowed_aliases={"datetime.datetime": {"dt"}},
+            filepath=p,
+        )
+    )
+    assert len(evaluations) == 0
+
+
+def test_get_imports_from_ast_nested():
+    result_ast = allowed_import_aliases.parse.get_ast_from_source(
+        source=(
+            "from typing import TYPE_CHECKING\n"
+            "if TYPE_CHECKING:\n"
+            "    import numpy as np\n"
+            "try:\n"
+            "    import ujson as json\n"
+            "except ImportError:\n"
+            "    import json as json\n"
+            "class A:\n"
+            "    def f(self):\n"
+            "        with open('f'):\n"
+            "            for _ in range(1):\n"
+            "                import pandas as pd\n"
+            "x = lambda: 1\n"
+        ),
+        filename="test.py",
+    )
+    imports = allowed_import_aliases.parse.get_imports_from_ast(result_ast)
+    assert imports == {
+        "numpy": {"np"},
+        "ujson": {"json"},
+        "json": {"json"},
+        "pandas": {"pd"},
+    }
+    assert list(imports) == ["numpy", "ujson", "json", "pandas"]
+
+
+def test_get_imports_from_ast_expression():
+    result_ast = ast.parse("lambda: 1", mode="eval")
+    imports = allowed_import_aliases.parse.get_imports_from_ast(result_ast)
+    assert imports == {}
+
+
+def test_may_contain_aliased_import():
+    may_contain_aliased_import = allowed_import_aliases.parse.may_contain_aliased_import
+    assert may_contain_aliased_import(b"import pandas as pd\n")
+    assert may_contain_aliased_import(b"from os import (\n\tpath\tas\tp,\n)\n")
+    assert not may_contain_aliased_import(b"import pandas\nclass A:\n    pass\n")
+    assert not may_contain_aliased_import(b"")
+
+
+def test_evaluate_file_without_aliases_skips_parse(tmp_path, monkeypatch):
+    p = tmp_path / "test.py"
+    with p.open("w") as f:
+        f.write("import pandas\nclass Base:\n    pass\n")
+
+    def _parse(*args, **kwargs):
+        raise AssertionError("ast.parse should not be called")
+
+    monkeypatch.setattr(ast, "parse", _parse)
+    evaluations = tuple(
+        allowed_import_aliases.parse.evaluate_file(allowed_aliases={}, filepath=p)
+    )
+    assert len(evaluations) == 0
+
+
+def test_may_contain_aliased_import_requires_import_before_as():
+    may_contain_aliased_import = allowed_import_aliases.parse.may_contain_aliased_import
+    assert not may_contain_aliased_import(b"try:\n    pass\nexcept Exception as e:\n")
+    assert not may_contain_aliased_import(b"with open('f') as f:\n    import os\n")
+
+
+def test_asname_eq_asname():
+    as_name = allowed_import_aliases.parse.AsName(
+        qualname="datetime.datetime",
+        alias="dt",
+        lineno=1,
+    )
+    other = allowed_import_aliases.parse.AsName(
+        qualname="datetime.datetime",
+        alias="dt",
+        lineno=2,
+    )
+    assert as_name == other
+    assert len({as_name, other}) == 1
+
+
+def test_asname_slots():
+    as_name = allowed_import_aliases.parse.AsName(
+        qualname="datetime.datetime",
+        alias="dt",
+        lineno=1,
+    )
+    assert not hasattr(as_name, "__dict__")
+
+
+def test_format_error_message_without_color(monkeypatch):
+    monkeypatch.setattr(
+        allowed_import_aliases.parse,
+        "_format_message",
+        allowed_import_aliases.parse._TEMPLATES[False][0].format,
+    )
+    monkeypatch.setattr(
+        allowed_import_aliases.parse,
+        "_format_allowed",
+        allowed_import_aliases.parse._TEMPLATES[False][1].format,
+    )
+    as_name = allowed_import_aliases.parse.AsName(
+        qualname="pandas",
+        alias="pa",
+        lineno=1,
+    )
+    message = allowed_import_aliases.parse.format_error_message(
+        filepath="test.py",
+        qualname="pandas",
+        allowed_aliases={"pd"},
+        actual_alias=as_name,
+    )
+    assert message == (
+        "test.py:1: pandas is aliased as pa. The only allowed alias is {'pd'}"
+    )
+
+
+def test_disallowed_import_alias_str():
+    as_name = allowed_import_aliases.parse.AsName(
+        qualname="pandas",
+        alias="pa",
+        lineno=1,
+    )
+    problem = allowed_import_aliases.parse.DisallowedImportAlias(
+        filepath="test.py",
+        qualname="pandas",
+        allowed_aliases=set(),
+        actual_alias=as_name,
+    )
+    assert str(problem) == allowed_import_aliases.parse.format_error_message(
+        filepath="test.py",
+        qualname="pandas",
+        allowed_aliases=set(),
+        actual_alias=as_name,
+    )
+    assert str(pickle.loads(pickle.dumps(problem))) == str(problem)
+
+
+def test_disallowed_import_alias_is_not_an_exception():
+    assert not issubclass(allowed_import_aliases.parse.DisallowedImportAlias, Exception)
+
+
+def test_get_imports_from_ast_interns_names():
+    result_ast = allowed_import_aliases.parse.get_ast_from_source(
+        source="from datetime import datetime as dt\n",
+        filename="test.py",
+    )
+    imports = allowed_import_aliases.parse.get_imports_from_ast(result_ast)
+    qualname = next(iter(imports))
+    (as_name,) = imports[qualname]
+    assert qualname is sys.intern("datetime.datetime")
+    assert as_name.qualname is qualname
+    assert as_name.alias is sys.intern("dt")
+
+
+def test_evaluate_with_many_allowances_with_asname_ok():
+    root = allowed_import_aliases.parse.get_ast_from_source(
+        source="import numpy as np\n", filename="<str>"
+    )
+    evaluations = tuple(
+        allowed_import_aliases.parse.evaluate(
+            allowed_aliases={"numpy": {"np", "numpy"}},
+            root=root,
+            filename="<str>",
+            lazy=False,
+        )
+    )
+    assert len(evaluations) == 0
+
+
+def test_evaluate_with_many_allowances_with_asname_bad():
+    root = allowed_import_aliases.parse.get_ast_from_source(
+        source="import numpy as nmpy\n", filename="<str>"
+    )
+    evaluations = tuple(
+        allowed_import_aliases.parse.evaluate(
+            allowed_aliases={"numpy": {"np", "numpy"}},
+            root=root,
+            filename="<str>",
+            lazy=False,
+        )
+    )
+    assert len(evaluations) == 1
+
+
+def test_evaluate_ordered_by_lineno():
+    root = allowed_import_aliases.parse.get_ast_from_source(
+        source="import numpy as a\nimport numpy as b\nimport numpy as c\n",
+        filename="<str>",
+    )
+    evaluations = tuple(
+        allowed_import_aliases.parse.evaluate(
+            allowed_aliases={},
+            root=root,
+            filename="<str>",
+            lazy=False,
+        )
+    )
+    assert [e.actual_alias.lineno for e in evaluations] == [1, 2, 3]
+
+
+def test_get_ast_from_filepath_empty(tmp_path):
+    filepath = tmp_path / "test_file.py"
+    filepath.touch()
+    result_ast = allowed_import_aliases.parse.get_ast_from_filepath(filepath=filepath)
+    assert isinstance(result_ast, ast.Module)
+    assert result_ast.body == []
+
+
+def test_get_ast_from_filepath_coding_cookie(tmp_path):
+    filepath = tmp_path / "test_file.py"
+    filepath.write_bytes("# -*- coding: latin-1 -*-\nx = 'é'\n".encode("latin-1"))
+    result_ast = allowed_import_aliases.parse.get_ast_from_filepath(filepath=filepath)
+    assert result_ast.body[0].value.value == "é"
+
+
+def test_format_error_message_frozenset():
+    as_name = allowed_import_aliases.parse.AsName(
+        qualname="numpy",
+        alias="nmpy",
+        lineno=1,
+    )
+    message = allowed_import_aliases.parse.format_error_message(
+        filepath="test.py",
+        qualname="numpy",
+        allowed_aliases=frozenset({"numpy", "np"}),
+        actual_alias=as_name,
+    )
+    assert "frozenset" not in message
+    assert "{'np', 'numpy'}" in message
+
+
+def test_import_without_stdout():
+    code = "import sys; sys.stdout = None; import allowed_import_aliases.parse"
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0